@@ -4,10 +4,50 @@ import itertools
 class Sentence:
     """Base type for all logical sentences."""
 
+    # Shared memo of evaluation results, keyed by node identity and the
+    # projection of the model onto the symbols that node actually uses.
+    # Shared subexpressions are therefore evaluated once per relevant
+    # sub-assignment instead of once per full model.
+    _evaluate_cache = {}
+
     def evaluate(self, model):
-        """Evaluate the logical sentence against the given truth `model`."""
+        """Evaluate the logical sentence against an integer truth `model`.
+
+        Models pack one truth bit per symbol at the positions assigned
+        by `bind`; results are memoized on the model's projection onto
+        this node's own symbols.
+        """
+        key = (id(self), model & self._mask)
+        try:
+            return Sentence._evaluate_cache[key]
+        except KeyError:
+            result = Sentence._evaluate_cache[key] = self._evaluate(model)
+            return result
+
+    def _evaluate(self, model):
+        """Compute the truth value directly, bypassing the memo."""
         raise Exception("nothing to evaluate")
 
+    def partial_evaluate(self, model, assigned):
+        """Three-valued evaluation under a partial integer model.
+
+        `assigned` marks which bits of `model` carry real assignments.
+        Returns True or False when every completion agrees, or None
+        while the truth value still depends on unassigned symbols.
+        """
+        raise Exception("nothing to evaluate")
+
+    def bind(self, symbol_index):
+        """Assign the model bit positions this sentence evaluates against.
+
+        Must be called with a `symbol_index` mapping names to bit
+        positions before `evaluate`, which reads models as integers.
+        """
+        mask = 0
+        for name in self._symbols:
+            mask |= 1 << symbol_index[name]
+        self._mask = mask
+
     def formula(self):
         """Return a string representation suitable for display."""
         return ""
@@ -25,39 +65,48 @@ class Sentence:
     @classmethod
     def parenthesize(cls, s):
         """Parenthesize an expression unless it is already balanced."""
-
-        def balanced(s):
-            """Return True when parentheses in `s` are balanced."""
-            count = 0
-            for c in s:
-                if c == "(":
-                    count += 1
-                elif c == ")":
-                    if count <= 0:
-                        return False
-                    count -= 1
-            return count == 0
-
-        if (
-            not len(s)
-            or s.isalpha()
-            or (s[0] == "(" and s[-1] == ")" and balanced(s[1:-1]))
-        ):
+        if not len(s) or s.isalpha():
             return s
-        else:
-            return f"({s})"
+
+        # An expression is already parenthesized when the leading "("
+        # closes exactly at the end; one pass over the string decides
+        # that without copying the inner substring
+        if s[0] == "(" and s[-1] == ")":
+            depth = 0
+            for position, char in enumerate(s):
+                if char == "(":
+                    depth += 1
+                elif char == ")":
+                    depth -= 1
+                    if depth == 0:
+                        if position == len(s) - 1:
+                            return s
+                        break
+        return f"({s})"
 
 
 class Symbol(Sentence):
     """Atomic proposition identified by name."""
 
+    # flyweight cache holding one shared instance per name, so equal
+    # symbols are also identical and comparisons short-circuit on `is`
+    _cache = {}
+
+    def __new__(cls, name):
+        """Return the shared instance for `name`, creating it once."""
+        symbol = cls._cache.get(name)
+        if symbol is None:
+            symbol = cls._cache[name] = super().__new__(cls)
+        return symbol
+
     def __init__(self, name):
-        """Store the symbol's `name`."""
+        """Store the symbol's `name` (idempotent on cached instances)."""
         self.name = name
+        self._symbols = frozenset((name,))
 
     def __eq__(self, other):
         """Compare by type and symbol name."""
-        return isinstance(other, Symbol) and self.name == other.name
+        return self is other or (isinstance(other, Symbol) and self.name == other.name)
 
     def __hash__(self):
         """Hash based on the symbol identity."""
@@ -67,17 +116,28 @@ class Symbol(Sentence):
         """Return debug-friendly representation."""
         return self.name
 
+    def bind(self, symbol_index):
+        """Record this symbol's bit position in integer models."""
+        self._bit = symbol_index[self.name]
+        self._mask = 1 << self._bit
+
     def evaluate(self, model):
         try:
-            return bool(model[self.name])
-        except KeyError:
-            raise Exception(f"variable {self.name} not in model")
+            return (model >> self._bit) & 1
+        except AttributeError:
+            raise Exception(f"variable {self.name} not bound to a model bit")
+
+    def partial_evaluate(self, model, assigned):
+        """Return this symbol's truth bit, or None while unassigned."""
+        if assigned & self._mask:
+            return bool((model >> self._bit) & 1)
+        return None
 
     def formula(self):
         return self.name
 
     def symbols(self):
-        return {self.name}
+        return self._symbols
 
 
 class Not(Sentence):
@@ -87,9 +147,12 @@ class Not(Sentence):
         """Create a negated sentence wrapping `operand`."""
         Sentence.validate(operand)
         self.operand = operand
+        self._symbols = operand._symbols
 
     def __eq__(self, other):
         """Check structural equality with another `Not`."""
+        if self is other:
+            return True
         return isinstance(other, Not) and self.operand == other.operand
 
     def __hash__(self):
@@ -100,9 +163,19 @@ class Not(Sentence):
         """Return debug string representation."""
         return f"Not({self.operand})"
 
-    def evaluate(self, model):
-        """Evaluate to the boolean negation of the operand."""
-        return not self.operand.evaluate(model)
+    def bind(self, symbol_index):
+        """Bind the operand and reuse its symbol bitmask."""
+        self.operand.bind(symbol_index)
+        self._mask = self.operand._mask
+
+    def _evaluate(self, model):
+        """Evaluate to the bitwise negation of the operand's truth bit."""
+        return self.operand.evaluate(model) ^ 1
+
+    def partial_evaluate(self, model, assigned):
+        """Negate the operand's partial truth value, keeping None."""
+        result = self.operand.partial_evaluate(model, assigned)
+        return None if result is None else not result
 
     def formula(self):
         """Return the printable negated formula."""
@@ -110,7 +183,7 @@ class Not(Sentence):
 
     def symbols(self):
         """Return symbols referenced by the operand."""
-        return self.operand.symbols()
+        return self._symbols
 
 
 class And(Sentence):
@@ -121,9 +194,19 @@ class And(Sentence):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
         self.conjuncts = list(conjuncts)
+        self._symbols = frozenset(
+            itertools.chain.from_iterable(
+                conjunct._symbols for conjunct in conjuncts
+            )
+        )
+        # Evaluate cheap conjuncts first so all() short-circuits before
+        # reaching costly ones; display order stays as constructed
+        self._eval_order = sorted(self.conjuncts, key=lambda c: len(c._symbols))
 
     def __eq__(self, other):
         """Check structural equality with another `And`."""
+        if self is other:
+            return True
         return isinstance(other, And) and self.conjuncts == other.conjuncts
 
     def __hash__(self):
@@ -139,10 +222,31 @@ class And(Sentence):
         """Append a new conjunct to the conjunction."""
         Sentence.validate(conjunct)
         self.conjuncts.append(conjunct)
-
-    def evaluate(self, model):
-        """Return True if all conjuncts evaluate to True in `model`."""
-        return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
+        self._symbols = self._symbols | conjunct._symbols
+        self._eval_order = sorted(self.conjuncts, key=lambda c: len(c._symbols))
+
+    def bind(self, symbol_index):
+        """Bind every conjunct and combine their symbol bitmasks."""
+        mask = 0
+        for conjunct in self.conjuncts:
+            conjunct.bind(symbol_index)
+            mask |= conjunct._mask
+        self._mask = mask
+
+    def _evaluate(self, model):
+        """Return a true bit only when all conjuncts are true in `model`."""
+        return all(conjunct.evaluate(model) for conjunct in self._eval_order)
+
+    def partial_evaluate(self, model, assigned):
+        """Return False on any false conjunct, True when all are true."""
+        unknown = False
+        for conjunct in self._eval_order:
+            result = conjunct.partial_evaluate(model, assigned)
+            if result is False:
+                return False
+            if result is None:
+                unknown = True
+        return None if unknown else True
 
     def formula(self):
         """Return a printable representation of the conjunction."""
@@ -153,8 +257,8 @@ class And(Sentence):
         )
 
     def symbols(self):
-        """Return a union of symbols across all conjuncts."""
-        return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
+        """Return the cached union of symbols across all conjuncts."""
+        return self._symbols
 
 
 class Or(Sentence):
@@ -165,9 +269,21 @@ class Or(Sentence):
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
         self.disjuncts = list(disjuncts)
+        self._symbols = frozenset(
+            itertools.chain.from_iterable(
+                disjunct._symbols for disjunct in disjuncts
+            )
+        )
+        # Wide disjuncts are the most likely to come out true, so try
+        # them first to give any() the earliest exit
+        self._eval_order = sorted(
+            self.disjuncts, key=lambda d: len(d._symbols), reverse=True
+        )
 
     def __eq__(self, other):
         """Check structural equality with another `Or`."""
+        if self is other:
+            return True
         return isinstance(other, Or) and self.disjuncts == other.disjuncts
 
     def __hash__(self):
@@ -179,9 +295,28 @@ class Or(Sentence):
         disjuncts = ", ".join([str(disjunct) for disjunct in self.disjuncts])
         return f"Or({disjuncts})"
 
-    def evaluate(self, model):
-        """Return True if any disjunct evaluates to True in `model`."""
-        return any(disjunct.evaluate(model) for disjunct in self.disjuncts)
+    def bind(self, symbol_index):
+        """Bind every disjunct and combine their symbol bitmasks."""
+        mask = 0
+        for disjunct in self.disjuncts:
+            disjunct.bind(symbol_index)
+            mask |= disjunct._mask
+        self._mask = mask
+
+    def _evaluate(self, model):
+        """Return a true bit when any disjunct is true in `model`."""
+        return any(disjunct.evaluate(model) for disjunct in self._eval_order)
+
+    def partial_evaluate(self, model, assigned):
+        """Return True on any true disjunct, False when all are false."""
+        unknown = False
+        for disjunct in self._eval_order:
+            result = disjunct.partial_evaluate(model, assigned)
+            if result is True:
+                return True
+            if result is None:
+                unknown = True
+        return None if unknown else False
 
     def formula(self):
         """Return a printable representation of the disjunction."""
@@ -192,8 +327,8 @@ class Or(Sentence):
         )
 
     def symbols(self):
-        """Return a union of symbols across all disjuncts."""
-        return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
+        """Return the cached union of symbols across all disjuncts."""
+        return self._symbols
 
 
 class Implication(Sentence):
@@ -205,9 +340,12 @@ class Implication(Sentence):
         Sentence.validate(consequent)
         self.antecedent = antecedent
         self.consequent = consequent
+        self._symbols = antecedent._symbols | consequent._symbols
 
     def __eq__(self, other):
         """Check structural equality with another `Implication`."""
+        if self is other:
+            return True
         return (
             isinstance(other, Implication)
             and self.antecedent == other.antecedent
@@ -222,9 +360,27 @@ class Implication(Sentence):
         """Return debug representation of the implication."""
         return f"Implication({self.antecedent}, {self.consequent})"
 
-    def evaluate(self, model):
-        """Return False only when antecedent is True and consequent False."""
-        return (not self.antecedent.evaluate(model)) or self.consequent.evaluate(model)
+    def bind(self, symbol_index):
+        """Bind both sides and combine their symbol bitmasks."""
+        self.antecedent.bind(symbol_index)
+        self.consequent.bind(symbol_index)
+        self._mask = self.antecedent._mask | self.consequent._mask
+
+    def _evaluate(self, model):
+        """Return a false bit only when antecedent holds and consequent fails."""
+        return (self.antecedent.evaluate(model) ^ 1) | self.consequent.evaluate(model)
+
+    def partial_evaluate(self, model, assigned):
+        """Settle the implication as soon as either side decides it."""
+        antecedent = self.antecedent.partial_evaluate(model, assigned)
+        if antecedent is False:
+            return True
+        consequent = self.consequent.partial_evaluate(model, assigned)
+        if consequent is True:
+            return True
+        if antecedent is True and consequent is False:
+            return False
+        return None
 
     def formula(self):
         """Return a printable representation of the implication."""
@@ -233,8 +389,8 @@ class Implication(Sentence):
         return f"{antecedent} => {consequent}"
 
     def symbols(self):
-        """Return a union of symbols across antecedent and consequent."""
-        return set.union(self.antecedent.symbols(), self.consequent.symbols())
+        """Return the cached union of symbols across antecedent and consequent."""
+        return self._symbols
 
 
 class Biconditional(Sentence):
@@ -246,9 +402,12 @@ class Biconditional(Sentence):
         Sentence.validate(right)
         self.left = left
         self.right = right
+        self._symbols = left._symbols | right._symbols
 
     def __eq__(self, other):
         """Check structural equality with another `Biconditional`."""
+        if self is other:
+            return True
         return (
             isinstance(other, Biconditional)
             and self.left == other.left
@@ -263,11 +422,25 @@ class Biconditional(Sentence):
         """Return debug representation of the biconditional."""
         return f"Biconditional({self.left}, {self.right})"
 
-    def evaluate(self, model):
-        """Return True when both sides share the same truth value."""
-        return (self.left.evaluate(model) and self.right.evaluate(model)) or (
-            not self.left.evaluate(model) and not self.right.evaluate(model)
-        )
+    def bind(self, symbol_index):
+        """Bind both sides and combine their symbol bitmasks."""
+        self.left.bind(symbol_index)
+        self.right.bind(symbol_index)
+        self._mask = self.left._mask | self.right._mask
+
+    def _evaluate(self, model):
+        """Return a true bit when both sides share the same truth value."""
+        return self.left.evaluate(model) ^ self.right.evaluate(model) ^ 1
+
+    def partial_evaluate(self, model, assigned):
+        """Compare both sides once they are both decided."""
+        left = self.left.partial_evaluate(model, assigned)
+        if left is None:
+            return None
+        right = self.right.partial_evaluate(model, assigned)
+        if right is None:
+            return None
+        return left == right
 
     def formula(self):
         """Return a printable representation of the biconditional."""
@@ -276,44 +449,252 @@ class Biconditional(Sentence):
         return f"{left} <=> {right}"
 
     def symbols(self):
-        """Return a union of symbols across both sides."""
-        return set.union(self.left.symbols(), self.right.symbols())
+        """Return the cached union of symbols across both sides."""
+        return self._symbols
+
+
+# Opcodes for flattened sentence programs (see _compile)
+_OP_SYM, _OP_NOT, _OP_AND, _OP_OR, _OP_IMPL, _OP_BICOND = range(6)
+
+
+def _compile(sentence):
+    """Flatten a bound sentence into a postfix (opcode, arg) program.
+
+    The program is evaluated by `_run` with a small stack machine,
+    trading one Python method call per AST node for a single loop over
+    precomputed opcodes. For SYM the arg is the symbol's model bit; for
+    AND/OR it is the number of operands to pop. `bind` must have run on
+    the sentence first.
+    """
+    program = []
+
+    def emit(sentence):
+        if isinstance(sentence, Symbol):
+            program.append((_OP_SYM, sentence._bit))
+        elif isinstance(sentence, Not):
+            emit(sentence.operand)
+            program.append((_OP_NOT, 0))
+        elif isinstance(sentence, And):
+            for conjunct in sentence._eval_order:
+                emit(conjunct)
+            program.append((_OP_AND, len(sentence.conjuncts)))
+        elif isinstance(sentence, Or):
+            for disjunct in sentence._eval_order:
+                emit(disjunct)
+            program.append((_OP_OR, len(sentence.disjuncts)))
+        elif isinstance(sentence, Implication):
+            emit(sentence.antecedent)
+            emit(sentence.consequent)
+            program.append((_OP_IMPL, 0))
+        elif isinstance(sentence, Biconditional):
+            emit(sentence.left)
+            emit(sentence.right)
+            program.append((_OP_BICOND, 0))
+        else:
+            raise Exception("cannot compile sentence")
+
+    emit(sentence)
+    return program
+
+
+def _run(program, model):
+    """Evaluate a compiled program against an integer `model`."""
+    stack = []
+    for op, arg in program:
+        if op == _OP_SYM:
+            stack.append((model >> arg) & 1)
+        elif op == _OP_NOT:
+            stack[-1] ^= 1
+        elif op == _OP_AND:
+            result = 1
+            for _ in range(arg):
+                result &= stack.pop()
+            stack.append(result)
+        elif op == _OP_OR:
+            result = 0
+            for _ in range(arg):
+                result |= stack.pop()
+            stack.append(result)
+        elif op == _OP_IMPL:
+            consequent = stack.pop()
+            stack[-1] = (stack[-1] ^ 1) | consequent
+        else:
+            right = stack.pop()
+            stack[-1] ^= right ^ 1
+    return stack[0]
+
+
+def _to_clauses(sentence, negated=False):
+    """Convert a sentence (or its negation) into CNF clauses.
+
+    Each clause is a frozenset of `(symbol name, polarity)` literals; the
+    returned list is their conjunction. Implications and biconditionals
+    are rewritten in terms of And/Or/Not, negations are pushed to the
+    leaves, and disjunctions of conjunctions are distributed back into
+    clause form.
+    """
+    if isinstance(sentence, Symbol):
+        return [frozenset({(sentence.name, not negated)})]
+    if isinstance(sentence, Not):
+        return _to_clauses(sentence.operand, not negated)
+    if isinstance(sentence, And):
+        # ¬(A ∧ B) becomes ¬A ∨ ¬B, so a negated And distributes
+        if negated:
+            return _distribute([_to_clauses(c, True) for c in sentence.conjuncts])
+        return [
+            clause
+            for conjunct in sentence.conjuncts
+            for clause in _to_clauses(conjunct, False)
+        ]
+    if isinstance(sentence, Or):
+        if negated:
+            return [
+                clause
+                for disjunct in sentence.disjuncts
+                for clause in _to_clauses(disjunct, True)
+            ]
+        return _distribute([_to_clauses(d, False) for d in sentence.disjuncts])
+    if isinstance(sentence, Implication):
+        return _to_clauses(
+            Or(Not(sentence.antecedent), sentence.consequent), negated
+        )
+    if isinstance(sentence, Biconditional):
+        return _to_clauses(
+            And(
+                Implication(sentence.left, sentence.right),
+                Implication(sentence.right, sentence.left),
+            ),
+            negated,
+        )
+    raise Exception("cannot convert to clauses")
+
+
+def _distribute(clause_sets):
+    """Distribute a disjunction of CNF clause sets back into CNF."""
+    result = [frozenset()]
+    for clauses in clause_sets:
+        result = [left | right for left in result for right in clauses]
+    return result
+
+
+def _propagate(clauses):
+    """Repeatedly assign unit clauses, simplifying the clause set.
+
+    Returns a `(clauses, forced)` pair where `forced` maps symbol names
+    to the truth values unit propagation fixed; `clauses` is None when
+    propagation derives a contradiction.
+    """
+    forced = {}
+    while True:
+        unit = next((clause for clause in clauses if len(clause) == 1), None)
+        if unit is None:
+            return clauses, forced
+        (name, value) = next(iter(unit))
+        forced[name] = value
+        simplified = []
+        for clause in clauses:
+            if (name, value) in clause:
+                continue
+            clause = clause - {(name, not value)}
+            if not clause:
+                return None, forced
+            simplified.append(clause)
+        clauses = simplified
+
+
+def _dpll(clauses):
+    """Return True when the CNF clause set is satisfiable (DPLL search)."""
+    clauses, _ = _propagate(clauses)
+    if clauses is None:
+        return False
+    if not clauses:
+        return True
+
+    # Split on some symbol from the first remaining clause; propagation
+    # in the recursive calls prunes the rest of the assignment space
+    (name, _) = next(iter(clauses[0]))
+    return _dpll(clauses + [frozenset({(name, True)})]) or _dpll(
+        clauses + [frozenset({(name, False)})]
+    )
 
 
 def model_check(knowledge, query):
     """Return True if the knowledge base logically entails the query."""
 
-    def check_all(knowledge, query, symbols, model):
+    # Results cached by node identity are only valid while these ASTs live
+    Sentence._evaluate_cache.clear()
+
+    def check_all(knowledge, query, symbols, next_index, model, assigned):
         """Recursively evaluate entailment under all symbol assignments."""
 
         # If model has an assignment for each symbol
-        if not symbols:
+        if next_index == len(symbols):
 
             # If knowledge base is true in model, then query must also be true
-            if knowledge.evaluate(model):
-                return query.evaluate(model)
+            if _run(knowledge_program, model):
+                return bool(_run(query_program, model))
             return True
         else:
 
-            # Choose one of the remaining unused symbols
-            remaining = symbols.copy()
-            p = remaining.pop()
-
-            # Create a model where the symbol is true
-            model_true = model.copy()
-            model_true[p] = True
-
-            # Create a model where the symbol is false
-            model_false = model.copy()
-            model_false[p] = False
-
-            # Ensure entailment holds in both models
-            return check_all(knowledge, query, remaining, model_true) and check_all(
-                knowledge, query, remaining, model_false
+            # Walk an index into the fixed symbol tuple; recursion then
+            # allocates nothing per level, with models extended in place
+            # by bitwise OR
+            p = symbols[next_index]
+            bit = 1 << symbol_index[p]
+            now_assigned = assigned | bit
+
+            # A branch whose partial model already falsifies the knowledge
+            # base is vacuously entailed, so skip its whole subtree
+            if knowledge.partial_evaluate(model | bit, now_assigned) is not False:
+                if not check_all(
+                    knowledge, query, symbols, next_index + 1, model | bit, now_assigned
+                ):
+                    return False
+            if knowledge.partial_evaluate(model, now_assigned) is False:
+                return True
+            return check_all(
+                knowledge, query, symbols, next_index + 1, model, now_assigned
             )
 
     # Get all symbols in both knowledge and query
-    symbols = set.union(knowledge.symbols(), query.symbols())
-
-    # Check that knowledge entails query
-    return check_all(knowledge, query, symbols, dict())
+    symbols = knowledge.symbols() | query.symbols()
+
+    # For larger knowledge bases, decide entailment as unsatisfiability
+    # of knowledge ∧ ¬query via DPLL; full enumeration stays cheaper on
+    # tiny symbol sets where clause conversion would dominate
+    if len(symbols) >= 10:
+        return not _dpll(_to_clauses(And(knowledge, Not(query))))
+
+    # Unit propagation over the knowledge base's clauses fixes symbols
+    # that hold in every model, so enumeration only splits on the rest
+    clauses, forced = _propagate(_to_clauses(knowledge))
+    if clauses is None:
+
+        # An unsatisfiable knowledge base entails everything
+        return True
+
+    # Models are plain integers holding one truth bit per symbol, so
+    # extending a model is a bitwise OR instead of a dict copy
+    symbol_index = {name: i for i, name in enumerate(sorted(symbols))}
+    knowledge.bind(symbol_index)
+    query.bind(symbol_index)
+
+    # Flatten both sentences once so the enumeration hot loop runs a
+    # stack machine over opcodes instead of recursive method dispatch
+    knowledge_program = _compile(knowledge)
+    query_program = _compile(query)
+
+    # Seed the model with the forced assignments; the original trees
+    # still drive evaluation, so the query needs no clause form
+    model = 0
+    assigned = 0
+    for name, value in forced.items():
+        bit = 1 << symbol_index[name]
+        assigned |= bit
+        if value:
+            model |= bit
+
+    # Check that knowledge entails query over the free symbols
+    return check_all(
+        knowledge, query, tuple(symbols - forced.keys()), 0, model, assigned
+    )
@@ -6,6 +6,15 @@ def in_range(height, width, cell):
     return 0 <= cell[0] < height and 0 <= cell[1] < width
 
 
+# the 8 relative offsets of a cell's neighborhood, hoisted so hot loops
+# skip rebuilding the nested lists and testing for (0, 0) every call
+_NEIGHBOR_OFFSETS = (
+    (-1, -1), (-1, 0), (-1, 1),
+    (0, -1), (0, 1),
+    (1, -1), (1, 0), (1, 1),
+)
+
+
 class Minesweeper:
     """Immutable board state tracking hidden mines."""
 
@@ -31,23 +40,16 @@ class Minesweeper:
         self.width = width
         self.mines = set()
         self.mines_found = set()
-        self.board = []
-
-        # initialize the board
-        for i in range(height):
-            row = []
-            for j in range(width):
-                row.append(False)
-            self.board.append(row)
-
-        # throw the mines randomly
-        while len(self.mines) != mines:
-            (i, j) = (
-                random.randint(0, self.height - 1),
-                random.randint(0, self.width - 1),
-            )
-            self.board[i][j] = True
-            self.mines.add((i, j))
+
+        # initialize the board as one flat row-major byte per cell, so
+        # mine flags sit in contiguous memory instead of nested lists
+        self.board = bytearray(height * width)
+
+        # throw the mines randomly; sampling flat indices without
+        # replacement places them in O(mines) with no collision retries
+        for index in random.sample(range(height * width), mines):
+            self.board[index] = 1
+            self.mines.add(divmod(index, width))
 
     # checking if the cell is in the range of the board
     # def in_range(self, i, j):
@@ -60,7 +62,7 @@ class Minesweeper:
         if not in_range(self.height, self.width, (i, j)):
             raise Exception("out of range!")
 
-        return self.board[i][j]
+        return bool(self.board[i * self.width + j])
 
     # how many mines are near by
     def nearby_mines(self, cell):
@@ -69,18 +71,16 @@ class Minesweeper:
         if not in_range(self.height, self.width, (row, col)):
             raise Exception("out of range!")
 
+        # sum each row's slice of the 3x3 neighborhood in one C-level
+        # reduction instead of eight bounds-checked lookups
+        left = max(0, col - 1)
+        right = min(self.width, col + 2)
         mines = 0
-        for i in [-1, 0, 1]:
-            for j in [-1, 0, 1]:
-                if (i, j) == (0, 0):
-                    continue
-                if (
-                    in_range(self.height, self.width, (row + i, col + j))
-                    and self.board[row + i][col + j]
-                ):
-                    mines += 1
+        for i in range(max(0, row - 1), min(self.height, row + 2)):
+            base = i * self.width
+            mines += sum(self.board[base + left : base + right])
 
-        return mines
+        return mines - self.board[row * self.width + col]
 
     # ckecking if we found all the mines
     def won(self):
@@ -91,15 +91,29 @@ class Minesweeper:
 class Sentence:
     """Logical statement of the form set(cells) = count mines."""
 
+    # board width used to map (row, col) cells onto single-int bitmasks;
+    # MinesweeperAI points this at the active board's width
+    board_width = 8
+
     def __init__(self, cells, count):
         """Create a new sentence tying cells to a mine count."""
-        self.cells = set(cells)
+        self.cells = frozenset(cells)
         self.count = count
 
+        # one bit per cell, so subset tests collapse to an AND+compare
+        mask = 0
+        for (i, j) in self.cells:
+            mask |= 1 << (i * Sentence.board_width + j)
+        self.mask = mask
+
     def __eq__(self, other):
         """Return True when both cell sets and counts match."""
         return self.cells == other.cells and self.count == other.count
 
+    def __hash__(self):
+        """Hash on the frozen cell set and count for O(1) dedup."""
+        return hash((self.cells, self.count))
+
     def __str__(self):
         """Printable form used in debugging output."""
         return f"{self.cells} = {self.count}"
@@ -119,13 +133,15 @@ class Sentence:
     def mark_mine(self, cell):
         """Remove a cell from the sentence when it is confirmed a mine."""
         if cell in self.cells:
-            self.cells.remove(cell)
+            self.cells = self.cells - {cell}
+            self.mask &= ~(1 << (cell[0] * Sentence.board_width + cell[1]))
             self.count -= 1
 
     def mark_safe(self, cell):
         """Remove a cell from the sentence when it is confirmed safe."""
         if cell in self.cells:
-            self.cells.remove(cell)
+            self.cells = self.cells - {cell}
+            self.mask &= ~(1 << (cell[0] * Sentence.board_width + cell[1]))
 
 
 class MinesweeperAI:
@@ -137,14 +153,20 @@ class MinesweeperAI:
         # set initial height and width
         self.height = h
         self.width = w
+        Sentence.board_width = w
         self.moves_made = set()
         self.mines = set()
         self.safes = set()
         self.knowledge = []
 
+        # cells that are still playable (not tried, not known mines),
+        # maintained incrementally so random moves need no board scan
+        self._candidates = {(i, j) for i in range(h) for j in range(w)}
+
     def mark_mine(self, cell):
         """Record a cell as a mine and update all sentences."""
         self.mines.add(cell)
+        self._candidates.discard(cell)
         for sentence in self.knowledge:
             sentence.mark_mine(cell)
 
@@ -158,20 +180,37 @@ class MinesweeperAI:
         """Infer additional sentences via subset relationships."""
         new_knowledge = []
 
-        # compare every pair of sentences
+        # (mask, count) pairs identify sentences, so dedup is one hash
+        # lookup and skips even building the duplicate Sentence
+        seen = {(sentence.mask, sentence.count) for sentence in self.knowledge}
+
+        # index sentences by cell so each sentence is only compared
+        # against sentences that share at least one of its cells
+        by_cell = {}
+        for sentence in self.knowledge:
+            for cell in sentence.cells:
+                by_cell.setdefault(cell, []).append(sentence)
+
         for sentence1 in self.knowledge:
-            for sentence2 in self.knowledge:
-                if sentence1 != sentence2 and sentence1.cells.issubset(sentence2.cells):
-                    # infer a new sentence
-                    inferred_cells = sentence2.cells - sentence1.cells
-                    inferred_count = sentence2.count - sentence1.count
-                    new_sentence = Sentence(inferred_cells, inferred_count)
+            if not sentence1.cells:
+                continue
 
-                    if (
-                        new_sentence not in self.knowledge
-                        and new_sentence not in new_knowledge
-                    ):
-                        new_knowledge.append(new_sentence)
+            # any superset of sentence1 contains all of its cells, so
+            # every candidate sits in one cell's bucket
+            for sentence2 in by_cell[next(iter(sentence1.cells))]:
+                if (
+                    sentence1 != sentence2
+                    and (sentence1.mask & sentence2.mask) == sentence1.mask
+                ):
+                    # infer a new sentence unless it is already known
+                    new_mask = sentence2.mask & ~sentence1.mask
+                    inferred_count = sentence2.count - sentence1.count
+                    if (new_mask, inferred_count) in seen:
+                        continue
+                    seen.add((new_mask, inferred_count))
+                    new_knowledge.append(
+                        Sentence(sentence2.cells - sentence1.cells, inferred_count)
+                    )
 
         # add any new sentences to the knowledge base
         self.knowledge.extend(new_knowledge)
@@ -179,42 +218,49 @@ class MinesweeperAI:
     def add_knowledge(self, cell, count):
         """Incorporate a revealed safe cell and nearby mine count."""
         self.moves_made.add(cell)
+        self._candidates.discard(cell)
         self.mark_safe(cell)
 
         count_mines = 0
         undtermined_moves = []
 
-        for di in [-1, 0, 1]:
-            for dj in [-1, 0, 1]:
-                if (di, dj) == (0, 0):
-                    continue
+        for di, dj in _NEIGHBOR_OFFSETS:
+            neighbor = (cell[0] + di, cell[1] + dj)
 
-                neighbor = (cell[0] + di, cell[1] + dj)
+            if neighbor in self.mines:
+                count_mines += 1
 
-                if neighbor in self.mines:
-                    count_mines += 1
-
-                if (
-                    in_range(self.height, self.width, neighbor)
-                    and neighbor not in self.safes
-                    and neighbor not in self.mines
-                ):
-                    undtermined_moves.append(neighbor)
+            if (
+                in_range(self.height, self.width, neighbor)
+                and neighbor not in self.safes
+                and neighbor not in self.mines
+            ):
+                undtermined_moves.append(neighbor)
 
         self.knowledge.append(Sentence(undtermined_moves, count - count_mines))
 
-        # update the knowledge based on the current knowledge
-        for sentence in self.knowledge:
-            if sentence.known_mines():
-                for cell in sentence.known_mines().copy():
-                    self.mark_mine(cell)
-            if sentence.known_safes():
-                for cell in sentence.known_safes().copy():
-                    self.mark_safe(cell)
+        # propagate known mines and safes to a fixpoint: marking a mine
+        # in one sentence can expose new conclusions in another
+        changed = True
+        while changed:
+            changed = False
+            for sentence in self.knowledge:
+                known_mines = sentence.known_mines() or frozenset()
+                for mine in known_mines - self.mines:
+                    self.mark_mine(mine)
+                    changed = True
+                known_safes = sentence.known_safes() or frozenset()
+                for safe in known_safes - self.safes:
+                    self.mark_safe(safe)
+                    changed = True
 
         # infer new sentences, compares the current sentences if one is a subset of the other it infers a new sentence
         self.infer_new_sentences()
 
+        # drop sentences whose cells were all resolved; they carry no
+        # information and would only bloat the pairwise inference loop
+        self.knowledge = [sentence for sentence in self.knowledge if sentence.cells]
+
     def make_safe_move(self):
         """Return a known safe cell that has not yet been played."""
         for cell in self.safes:
@@ -224,9 +270,6 @@ class MinesweeperAI:
 
     def make_random_move(self):
         """Choose a random move among untried, unknown cells."""
-        moves = []
-        for i in range(self.height):
-            for j in range(self.width):
-                if (i, j) not in self.moves_made and (i, j) not in self.mines:
-                    moves.append((i, j))
-        return random.choice(moves) if len(moves) != 0 else None
+        if not self._candidates:
+            return None
+        return random.choice(tuple(self._candidates))